@@ -1,33 +1,43 @@
-import argparse
-
 import os
 import re
 import sys
 
 import shutil
+import functools
+import collections
 import tempfile
 import subprocess
+import string
 
-from dataclasses import dataclass, field
-from html.parser import HTMLParser
-from typing      import List, Optional, Tuple
+from dataclasses import dataclass
+from typing      import Dict, List, Optional, Tuple
 from html        import unescape
 
 from PyQt5.QtCore import (
-    Qt, QUrl, QModelIndex, QByteArray, QSortFilterProxyModel, QRect, QPoint
+    Qt, QUrl, QModelIndex, QByteArray, QSortFilterProxyModel, QRect, QPoint,
+    QAbstractItemModel, QAbstractListModel, QTimer, QRectF, QObject, QRunnable, QThreadPool,
+    pyqtSignal
 )
 from PyQt5.QtGui import (
-    QStandardItem, QStandardItemModel, QIcon, QPalette, QColor,
+    QIcon, QPalette, QColor,
     QPixmap, QPainter, QGuiApplication
 )
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QTreeView, QToolBar, QAction, QFileDialog, QLineEdit, QLabel,
-    QMessageBox, QStyle, QTabWidget, QPushButton, QStatusBar
+    QMessageBox, QStyle, QTabWidget, QPushButton, QStatusBar, QProgressBar
 )
-from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtSvg import QSvgRenderer
 
+from pyview_parser import TocNode, parse_hh_file
+
+_URL_RE = re.compile(r"^[a-zA-Z]+://")
+_WS_RE = re.compile(r"\s+")
+
+ROLE_LOCAL = Qt.UserRole + 1
+ROLE_BREAD = Qt.UserRole + 2
+ROLE_TITLE_LC = Qt.UserRole + 3
+
 SVG_BOOK = r"""
 <svg xmlns="http://www.w3.org/2000/svg" width="16" height="16">
   <rect x="2" y="2" width="11" height="12" rx="2" fill="#3b82f6"/>
@@ -49,138 +59,174 @@ SVG_PAGE = r"""
 """
 
 
-def icon_from_svg(svg: str, size: int = 16) -> QIcon:
+@functools.lru_cache(maxsize=32)
+def _render_svg_icon(svg: str, size: int, dpr_pct: int) -> QIcon:
+    dpr = dpr_pct / 100.0
     renderer = QSvgRenderer(QByteArray(svg.encode("utf-8")))
-    pix = QPixmap(size, size)
+    pix = QPixmap(int(size * dpr), int(size * dpr))
+    pix.setDevicePixelRatio(dpr)
     pix.fill(Qt.transparent)
     p = QPainter(pix)
-    renderer.render(p)
+    renderer.render(p, QRectF(0, 0, size, size))
     p.end()
     return QIcon(pix)
 
 
-@dataclass
-class TocNode:
-    title: str
-    local: Optional[str] = None
-    children: List["TocNode"] = field(default_factory=list)
+def icon_from_svg(svg: str, size: int = 16) -> QIcon:
+    # einmal in Bildschirmauflösung rastern (HiDPI), Ergebnis je (svg, size, dpr) cachen
+    screen = QGuiApplication.primaryScreen()
+    dpr = screen.devicePixelRatio() if screen else 1.0
+    return _render_svg_icon(svg, size, round(dpr * 100))
 
 
-class HtmlHelpParser(HTMLParser):
+class RecursiveFilterProxy(QSortFilterProxyModel):
     """
-    Parser für htmlhelp .hhc (Contents) und .hhk (Index).
-    Beide nutzen:
-      <OBJECT type="text/sitemap">
-         <param name="Name" value="...">
-         <param name="Local" value="...">
-      </OBJECT>
-      <UL> ... </UL> (optional)
+    Filtert gegen eine Rolle mit vorab kleingeschriebenem Titel.
+    Dadurch reicht ein case-sensitiver Vergleich, nur die Suche wird pro Eingabe lowercased.
     """
-    def __init__(self):
+    def __init__(self, filter_role: int):
         super().__init__()
-        self.root = TocNode("ROOT")
-        self._stack: List[TocNode] = [self.root]
-
-        self._in_object = False
-        self._cur_name: Optional[str] = None
-        self._cur_local: Optional[str] = None
-
-        self._last_created: Optional[TocNode] = None
-        self._pending_push_on_ul = False
-
-    def handle_starttag(self, tag, attrs):
-        tag = tag.lower()
-        attrs = {k.lower(): v for k, v in attrs}
-
-        if tag == "object":
-            t = (attrs.get("type") or "").lower()
-            if "text/sitemap" in t:
-                self._in_object = True
-                self._cur_name = None
-                self._cur_local = None
-
-        elif tag == "param" and self._in_object:
-            name = (attrs.get("name") or "").lower()
-            value = (attrs.get("value") or "").strip()
-            if name == "name":
-                self._cur_name = value
-            elif name == "local":
-                self._cur_local = value
-
-        elif tag == "ul":
-            if self._pending_push_on_ul and self._last_created is not None:
-                self._stack.append(self._last_created)
-                self._pending_push_on_ul = False
-
-    def handle_endtag(self, tag):
-        tag = tag.lower()
-
-        if tag == "object" and self._in_object:
-            self._in_object = False
-            title = (self._cur_name or "Untitled").strip()
-            local = (self._cur_local or "").strip() or None
-
-            node = TocNode(title=title, local=local)
-            self._stack[-1].children.append(node)
-
-            self._last_created = node
-            self._pending_push_on_ul = True
-
-        elif tag == "ul":
-            if len(self._stack) > 1:
-                self._stack.pop()
-
-    def unknown_decl(self, data):
-        pass
-
+        self.setFilterCaseSensitivity(Qt.CaseSensitive)
+        # Rekursives Filtern macht Qt selbst (C++), kein filterAcceptsRow in Python
+        self.setRecursiveFilteringEnabled(True)
+        self.setFilterKeyColumn(0)
+        self.setFilterRole(filter_role)
 
-def _read_text_fallback(path: str) -> str:
-    for enc in ("utf-8-sig", "utf-8", "cp1252", "latin-1"):
-        try:
-            with open(path, "r", encoding=enc, errors="strict") as f:
-                return f.read()
-        except Exception:
-            pass
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        return f.read()
-
-
-def parse_hh_file(path: str) -> TocNode:
-    raw = _read_text_fallback(path)
-    p = HtmlHelpParser()
-    p.feed(raw)
-    return p.root
+    def setFilterText(self, text: str):
+        self.setFilterFixedString((text or "").strip().lower())
 
 
-class RecursiveFilterProxy(QSortFilterProxyModel):
-    def __init__(self):
+class TocModel(QAbstractItemModel):
+    """
+    Contents-Model direkt auf dem TocNode-Baum.
+    Keine Item-Objekte pro Knoten – Daten (auch der Breadcrumb) entstehen erst in data().
+    """
+    def __init__(self, icon_book: QIcon, icon_page: QIcon, header: str):
         super().__init__()
-        self._text = ""
-        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
-        if hasattr(self, "setRecursiveFilteringEnabled"):
-            self.setRecursiveFilteringEnabled(True)
-
-    def setFilterText(self, text: str):
-        self._text = (text or "").strip()
-        self.invalidateFilter()
+        self.root = TocNode("ROOT")
+        self._icon_book = icon_book
+        self._icon_page = icon_page
+        self._header = header
+
+    def setRoot(self, root: TocNode):
+        self.beginResetModel()
+        self.root = root
+        self.endResetModel()
+
+    def _node(self, index: QModelIndex) -> TocNode:
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if column != 0:
+            return QModelIndex()
+        children = self._node(parent).children
+        if not 0 <= row < len(children):
+            return QModelIndex()
+        return self.createIndex(row, 0, children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        p = index.internalPointer().parent
+        if p is None or p is self.root:
+            return QModelIndex()
+        return self.createIndex(p.row, 0, p)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return bool(self._node(parent).children)
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return self._header
+        return None
 
-    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
-        if not self._text:
-            return True
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node: TocNode = index.internalPointer()
+
+        if role == Qt.DisplayRole:
+            return node.title
+        if role == ROLE_TITLE_LC:
+            return node.title_lc
+        if role == Qt.DecorationRole:
+            return self._icon_book if node.children else self._icon_page
+        if role == ROLE_LOCAL:
+            return node.local or ""
+        if role == ROLE_BREAD:
+            path: List[str] = []
+            n = node
+            while n is not None and n is not self.root:
+                path.append(n.title)
+                n = n.parent
+            return " › ".join(reversed(path))
+        return None
 
-        model = self.sourceModel()
-        idx = model.index(source_row, 0, source_parent)
-        if not idx.isValid():
-            return False
 
-        title = model.data(idx, Qt.DisplayRole) or ""
-        if self._text.lower() in title.lower():
-            return True
+class FlatIndexModel(QAbstractListModel):
+    """
+    Index als flache Liste über drei parallele Listen (Titel, Local, Titel lowercase).
+    """
+    def __init__(self, icon_page: QIcon, header: str):
+        super().__init__()
+        self._icon_page = icon_page
+        self._header = header
+        self._titles: List[str] = []
+        self._locals: List[str] = []
+        self._titles_lc: List[str] = []
+
+    def setEntries(self, titles: List[str], locals_: List[str], titles_lc: List[str]):
+        self.beginResetModel()
+        self._titles = titles
+        self._locals = locals_
+        self._titles_lc = titles_lc
+        self.endResetModel()
+
+    def clear(self):
+        self.setEntries([], [], [])
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._titles)
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemNeverHasChildren
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return self._header
+        return None
 
-        for r in range(model.rowCount(idx)):
-            if self.filterAcceptsRow(r, idx):
-                return True
-        return False
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+
+        if role == Qt.DisplayRole or role == ROLE_BREAD:
+            return self._titles[row]
+        if role == ROLE_TITLE_LC:
+            return self._titles_lc[row]
+        if role == ROLE_LOCAL:
+            return self._locals[row]
+        if role == Qt.DecorationRole:
+            return self._icon_page
+        return None
 
 
 def decompile_chm_windows(chm_path: str, out_dir: str) -> bool:
@@ -201,6 +247,84 @@ def decompile_chm_windows(chm_path: str, out_dir: str) -> bool:
     except Exception:
         return False
 
+
+def _find_first(folder: str, exts: Tuple[str, ...]) -> Optional[str]:
+    with os.scandir(folder) as it:
+        for e in it:
+            if e.name.lower().endswith(exts):
+                return e.path
+    return None
+
+
+@dataclass
+class ChmLoadResult:
+    base_dir: str
+    toc: TocNode
+    index: Optional[TocNode] = None
+
+
+class ChmLoadSignals(QObject):
+    finished = pyqtSignal(object)   # ChmLoadResult
+    failed = pyqtSignal(str, str)   # Titel, Meldung
+
+
+class ChmLoadWorker(QRunnable):
+    """
+    Läuft im QThreadPool: findet/dekompiliert die .hhc/.hhk und parst sie.
+    Nur reines Python, kein Qt-GUI – das Model wird im UI-Thread befüllt.
+    """
+    def __init__(self, chm_path: str):
+        super().__init__()
+        self.chm_path = chm_path
+        self.signals = ChmLoadSignals()
+
+    def run(self):
+        try:
+            self._run()
+        except Exception as e:
+            self.signals.failed.emit("Fehler beim Laden", str(e))
+
+    def _run(self):
+        """
+        1) Try: side-by-side .hhc/.hhk in same folder as CHM
+        2) Else: Windows hh.exe -decompile to temp -> load .hhc/.hhk from there
+        """
+        chm_path = self.chm_path
+        folder = os.path.dirname(chm_path)
+        stem = os.path.splitext(os.path.basename(chm_path))[0]
+
+        hhc = os.path.join(folder, f"{stem}.hhc")
+        hhk = os.path.join(folder, f"{stem}.hhk")
+
+        if os.path.exists(hhc):
+            base_dir = folder
+            hhk = hhk if os.path.exists(hhk) else None
+        else:
+            # fallback: decompile CHM
+            tmp = tempfile.mkdtemp(prefix="chm_decompile_")
+            if not decompile_chm_windows(chm_path, tmp):
+                self.signals.failed.emit(
+                    "TOC nicht verfügbar",
+                    "Keine passende .hhc neben der CHM gefunden und CHM konnte nicht dekompiliert werden.\n\n"
+                    "Windows: stelle sicher, dass 'hh.exe' verfügbar ist.\n"
+                    "Alternative: CHM manuell dekompilieren und dann die entpackten Dateien anzeigen."
+                )
+                return
+
+            # pick first .hhc/.hhk in temp
+            hhc = _find_first(tmp, (".hhc",))
+            hhk = _find_first(tmp, (".hhk",))
+
+            if not hhc:
+                self.signals.failed.emit("Keine .hhc gefunden", "Nach Dekomplilierung wurde keine .hhc gefunden.")
+                return
+            base_dir = tmp
+
+        toc = parse_hh_file(hhc)
+        index = parse_hh_file(hhk) if hhk else None
+        self.signals.finished.emit(ChmLoadResult(base_dir, toc, index))
+
+
 class TitleBar(QWidget):
     def __init__(self, window: QMainWindow):
         super().__init__(window)
@@ -345,14 +469,200 @@ class TitleBar(QWidget):
             self.toggle_max_restore()
             event.accept()
 
+# Resize-Kanten: bit0=L, bit1=R, bit2=T, bit3=B -> Kantenname
+# (L+R bzw. T+B gleichzeitig nur bei winzigem Fenster, dann wie bisher die erste passende Kante)
+_EDGES = (
+    None, "L", "R", "L",
+    "T", "LT", "RT", "LT",
+    "B", "LB", "RB", "LB",
+    "T", "LT", "RT", "LT",
+)
+
+
+# -------- Theme --------
+# Farben je Theme; das QSS-Template wird pro Theme nur einmal substituiert (MainWindow._qss_cache)
+# mehrfach genutzte Farben nur einmal anlegen
+YELLOW = sys.intern("#ffd866")
+WHITE = sys.intern("#ffffff")
+BLACK = sys.intern("#000000")
+BORDER_DARK = sys.intern("#333333")
+BORDER_LIGHT = sys.intern("#d0d0d0")
+
+DARK_VARS = {
+    "tree_bg":               "#181818",
+    "tree_fg":               WHITE,
+    "sel_bg":                "#2b4c7e",
+    "sel_fg":                WHITE,
+    "border":                BORDER_DARK,
+
+    "tab_bg":                "#1c1c1c",
+    "tab_bar_bg":            "#161616",
+    "tab_fg":                "#eaeaea",
+    "tab_fg_active":         YELLOW,
+    "tab_sel_bg":            "#242424",
+    "tab_hover_bg":          "#202020",
+
+    "toolbar_bg":            "#1a1a1a",
+    "toolbtn_bg":            "#222222",
+    "toolbtn_fg":            YELLOW,
+    "toolbtn_hover":         "#2a2a2a",
+    "toolbtn_pressed":       "#303030",
+
+    "title_bg":              "#121212",  # Hintergrund Titelleiste
+    "title_fg":              YELLOW,     # Text/Farbe Buttons (oder "#ffffff")
+    "title_btn_bg":          "#1f1f1f",  # Buttons normal
+    "title_btn_hover":       "#2a2a2a",  # Buttons hover
+    "title_btn_close_hover": "#8a1f1f",  # Close hover
+
+    "status_bg":             "#121212",
+    "status_fg":             YELLOW,     # oder "#ffffff"
+    "status_border":         BORDER_DARK,
+
+    # Scrollbar dark-blue
+    "scroll_track":          "#141414",
+    "scroll_handle":         "#0b2a4a",
+    "scroll_handle_hover":   "#0f3a66",
+}
+
+LIGHT_VARS = {
+    "tree_bg":               WHITE,
+    "tree_fg":               BLACK,
+    "sel_bg":                "#cfe3ff",
+    "sel_fg":                BLACK,
+    "border":                BORDER_LIGHT,
+
+    "tab_bg":                "#f4f4f4",
+    "tab_bar_bg":            "#ededed",
+    "tab_fg":                BLACK,
+    "tab_fg_active":         BLACK,
+    "tab_sel_bg":            WHITE,
+    "tab_hover_bg":          "#f9f9f9",
+
+    "toolbar_bg":            "#f2f2f2",
+    "toolbtn_bg":            "#e9e9e9",
+    "toolbtn_fg":            BLACK,
+    "toolbtn_hover":         "#dedede",
+    "toolbtn_pressed":       "#d2d2d2",
+
+    "title_bg":              "#eaeaea",
+    "title_fg":              BLACK,
+    "title_btn_bg":          "#f3f3f3",
+    "title_btn_hover":       "#dedede",
+    "title_btn_close_hover": "#e06c75",
+
+    "status_bg":             "#ededed",
+    "status_fg":             BLACK,
+    "status_border":         BORDER_LIGHT,
+
+    # Scrollbar light-gray
+    "scroll_track":          "#f2f2f2",
+    "scroll_handle":         "#c8c8c8",
+    "scroll_handle_hover":   "#b0b0b0",
+}
+
+# Dark-CSS für die Webseiten ein-/ausblenden
+_DARK_CSS_SCRIPT_NAME = "__qt_dark_css__"
+# nur für file/http(s)-Dokumente mit <head> (kein about:blank o.ä.)
+_DARK_CSS_JS = """
+(function(){if(!/^(file|https?):$/.test(location.protocol)||!document.head)return;
+const id='__qt_dark_css__';let s=document.getElementById(id);if(!s){s=document.createElement('style');
+s.id=id;s.innerHTML=`html, body { background:#141414 !important;color:#eaeaea !important;}
+a { color:#8ab4ff !important;}pre, code { background:#1e1e1e !important;}
+`;document.head.appendChild(s);}})();"""
+
+_LIGHT_CSS_JS = """(function(){const s=document.getElementById('__qt_dark_css__');if(s) s.remove();})();"""
+
+# feste Palettenfarben (Dark) einmal anlegen statt pro Apply
+_DARK_WINDOW = QColor(30, 30, 30)
+_DARK_ALT = QColor(35, 35, 35)
+
+
+@functools.lru_cache(maxsize=None)
+def _qcolor(name: str) -> QColor:
+    return QColor(name)
+
+
+_QSS_TEMPLATE = string.Template(r"""
+QToolBar {spacing: 8px;background: $toolbar_bg;border: none;}
+QToolBar::separator {background: $border;width: 1px;margin: 6px 8px;}
+QLineEdit {padding: 6px 10px;border-radius: 10px;border: 1px solid $border;background: $tab_bg;color: $tab_fg;}
+QLabel {color: $tab_fg;}
+QToolButton {background: $toolbtn_bg;color: $toolbtn_fg;border: 1px solid $border;border-radius: 10px;padding: 6px 10px;}
+QToolButton:hover {background: $toolbtn_hover;}
+QToolButton:pressed {background: $toolbtn_pressed;}
+QTabWidget::pane {border: 1px solid $border;top: -1px;background: $tab_bg;}
+QTabBar {background: $tab_bar_bg;}
+QTabBar::tab {background: $tab_bar_bg;color: $tab_fg;border: 1px solid $border;border-bottom: none;padding: 7px 14px;margin-right: 6px;border-top-left-radius: 12px;border-top-right-radius: 12px;min-width: 90px;}
+QTabBar::tab:hover {background: $tab_hover_bg;}
+QTabBar::tab:selected {background: $tab_sel_bg;color: $tab_fg_active;}
+QTreeView {border: none;}
+QTreeView::item:selected {background: palette(highlight);color: palette(highlighted-text);}
+QHeaderView::section {background: palette(button);color: palette(button-text);padding: 6px;border: none;border-bottom: 1px solid $border;}
+QPushButton {background: palette(button);color: palette(button-text);border: 1px solid $border;border-radius: 10px;padding: 7px 12px;}
+QPushButton:hover {background: $toolbtn_hover;}
+QPushButton:pressed {background: $toolbtn_pressed;}
+/* Scrollbars (TreeView etc.) */
+QScrollBar:vertical,QScrollBar:horizontal {background: $scroll_track;margin: 0px;border: none;border-radius: 6px;}
+QScrollBar:vertical {width: 12px;}
+QScrollBar:horizontal {height: 12px;}
+QScrollBar::handle:vertical,QScrollBar::handle:horizontal {background: $scroll_handle;border-radius: 6px;}
+QScrollBar::handle:vertical {min-height: 28px;}
+QScrollBar::handle:horizontal {min-width: 28px;}
+QScrollBar::handle:hover {background: $scroll_handle_hover;}
+QScrollBar::add-line:vertical,QScrollBar::sub-line:vertical {height: 0px;}
+QScrollBar::add-line:horizontal,QScrollBar::sub-line:horizontal {width: 0px;}
+QScrollBar::add-page,QScrollBar::sub-page {background: transparent;}
+/* Custom Title Bar */
+#TopContainer { background: transparent; }
+#TitleBar {background: $title_bg;}
+#TitleLabel {color: $title_fg;font-weight: 600;}
+#TitleSeparator {background: $border;}
+#TitleBar QPushButton {background: $title_btn_bg;color: $title_fg;border: 1px solid $border;border-radius: 10px;}
+#TitleBar QPushButton:hover {background: $title_btn_hover;}
+#TitleBar QPushButton#TitleBtnClose:hover {background: $title_btn_close_hover;}
+QStatusBar {background: $status_bg;color: $status_fg;border-top: 1px solid $status_border;}
+QStatusBar QLabel {color: $status_fg;}
+/* Tab scrollers (left/right arrows) */
+QTabBar::scroller {width: 22px;height: 22px;background: $tab_bar_bg;border: 1px solid $border;border-radius: 10px;margin: 2px;}
+QTabBar::scroller:hover {background: $tab_hover_bg;}
+/* Arrow icons color via "color" + qproperty (works in many styles) */
+QTabBar QToolButton {background: $tab_bar_bg;border: 1px solid $border;border-radius: 10px;padding: 2px;color: $tab_fg_active;}
+QTabBar QToolButton:hover {background: $tab_hover_bg;}
+QTabBar QToolButton:pressed {background: $tab_sel_bg;}
+QSplitter {background: $tree_bg;}
+QSplitter::handle {background: $border;}
+QWebEngineView {background: $tree_bg;}""")
+
+
+class QssWarmup(QRunnable):
+    """
+    Substituiert die QSS-Variante, die gerade *nicht* angewendet wird, im Hintergrund vor,
+    damit der erste Theme-Wechsel nur noch den fertigen String aus MainWindow._qss_cache holt.
+    """
+    def __init__(self, dark: bool):
+        super().__init__()
+        self._dark = dark
+
+    def run(self):
+        if self._dark not in MainWindow._qss_cache:
+            MainWindow._qss_cache[self._dark] = _QSS_TEMPLATE.substitute(
+                DARK_VARS if self._dark else LIGHT_VARS)
+
+
 class MainWindow(QMainWindow):
-    ROLE_LOCAL = Qt.UserRole + 1
-    ROLE_BREAD = Qt.UserRole + 2
+    ROLE_LOCAL = ROLE_LOCAL
+    ROLE_BREAD = ROLE_BREAD
+    ROLE_TITLE_LC = ROLE_TITLE_LC
+
+    _qss_cache: Dict[bool, str] = {}
 
     def __init__(self):
         super().__init__()
         
         self._pending_page: Optional[str] = None
+        self._first_local: Optional[str] = None
+        self._load_seq = 0
+        self._load_worker: Optional[ChmLoadWorker] = None
         
         self._resize_margin = 8  # Pixel "Griffbreite" am Rand
         self._resizing      = False
@@ -384,7 +694,13 @@ class MainWindow(QMainWindow):
         
         
         self.base_dir: Optional[str] = None
+        self._base_norm: Optional[str] = None
         self.dark_mode = False
+        self._applied_theme: Optional[bool] = None
+        self._standard_palette = QPalette(QApplication.instance().style().standardPalette())
+        # beide Paletten einmal bauen, _apply_theme setzt nur noch die fertige
+        self._dark_palette = self._build_palette(True)
+        self._light_palette = self._build_palette(False)
 
         # Icons
         try:
@@ -394,9 +710,10 @@ class MainWindow(QMainWindow):
             self.icon_book = self.style().standardIcon(QStyle.SP_DirIcon)
             self.icon_page = self.style().standardIcon(QStyle.SP_FileIcon)
 
-        # Web
-        self.web = QWebEngineView()
-        self.web.urlChanged.connect(self._on_url_changed)
+        # Web: QWebEngineView (Chromium) erst beim ersten Laden einer CHM, siehe _ensure_web
+        self.web = None
+        self._web_placeholder = QWidget()
+        self._dark_css_script = None
 
         # Tabs left
         self.tabs = QTabWidget()
@@ -405,14 +722,21 @@ class MainWindow(QMainWindow):
         self.tabs.tabBar().setUsesScrollButtons(True)
 
         # Contents model/view
-        self.contents_model = QStandardItemModel()
-        self.contents_model.setHorizontalHeaderLabels(["Contents"])
-        self.contents_proxy = RecursiveFilterProxy()
+        self.contents_model = TocModel(self.icon_book, self.icon_page, "Contents")
+        self.contents_proxy = RecursiveFilterProxy(self.ROLE_TITLE_LC)
         self.contents_proxy.setSourceModel(self.contents_model)
 
         self.contents_filter = QLineEdit()
         self.contents_filter.setPlaceholderText("Filter (Contents)…")
-        self.contents_filter.textChanged.connect(self.contents_proxy.setFilterText)
+
+        # Tastendrücke sammeln, erst nach kurzer Pause filtern
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(
+            lambda: self.contents_proxy.setFilterText(self.contents_filter.text())
+        )
+        self.contents_filter.textChanged.connect(lambda _text: self._filter_timer.start())
 
         self.contents_tree = QTreeView()
         self.contents_tree.setModel(self.contents_proxy)
@@ -428,14 +752,20 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(tab_contents, "Contents")
 
         # Index model/view
-        self.index_model = QStandardItemModel()
-        self.index_model.setHorizontalHeaderLabels(["Index"])
-        self.index_proxy = RecursiveFilterProxy()
+        self.index_model = FlatIndexModel(self.icon_page, "Index")
+        self.index_proxy = RecursiveFilterProxy(self.ROLE_TITLE_LC)
         self.index_proxy.setSourceModel(self.index_model)
 
         self.index_filter = QLineEdit()
         self.index_filter.setPlaceholderText("Filter (Index)…")
-        self.index_filter.textChanged.connect(self.index_proxy.setFilterText)
+
+        self._index_filter_timer = QTimer(self)
+        self._index_filter_timer.setSingleShot(True)
+        self._index_filter_timer.setInterval(150)
+        self._index_filter_timer.timeout.connect(
+            lambda: self.index_proxy.setFilterText(self.index_filter.text())
+        )
+        self.index_filter.textChanged.connect(lambda _text: self._index_filter_timer.start())
 
         self.index_view = QTreeView()
         self.index_view.setModel(self.index_proxy)
@@ -477,14 +807,23 @@ class MainWindow(QMainWindow):
         # Splitter
         splitter = QSplitter(Qt.Horizontal)
         splitter.addWidget(self.tabs)
-        splitter.addWidget(self.web)
+        splitter.addWidget(self._web_placeholder)
         splitter.setStretchFactor(0, 0)
         splitter.setStretchFactor(1, 1)
         splitter.setSizes([380, 820])
+        self.splitter = splitter
 
         self.status = QStatusBar(self)
         self.setStatusBar(self.status)
         self.status.showMessage("Ready", 2000)
+
+        # Busy-Anzeige während ChmLoadWorker läuft
+        self.busy = QProgressBar()
+        self.busy.setRange(0, 0)
+        self.busy.setMaximumWidth(120)
+        self.busy.setTextVisible(False)
+        self.busy.hide()
+        self.status.addPermanentWidget(self.busy)
         
         central = QWidget()
         lay = QVBoxLayout(central)
@@ -493,11 +832,22 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central)
 
         self._make_toolbar()
+
+        # aktuelles Theme baut _apply_theme() gleich selbst, vorbereitet wird nur das andere
+        if (not self.dark_mode) not in self._qss_cache:
+            QThreadPool.globalInstance().start(QssWarmup(not self.dark_mode))
+
+        # QApplication.setPalette erreicht nicht zuverlässig alle Widgets -> feste, kleine Liste
+        self._styled_widgets: List[QWidget] = [
+            self, self.titlebar, self.toolbar, self.tabs,
+            self.contents_tree, self.index_view, self.status,
+        ]
         self._apply_theme()
 
     # -------- Toolbar --------
     def _make_toolbar(self):
         tb = QToolBar("Main")
+        self.toolbar = tb
         tb.setMovable(False)
         self.addToolBar(tb)
 
@@ -512,15 +862,15 @@ class MainWindow(QMainWindow):
         tb.addAction(act_home)
 
         act_back = QAction(self.style().standardIcon(QStyle.SP_ArrowBack), "Back", self)
-        act_back.triggered.connect(self.web.back)
+        act_back.triggered.connect(self.go_back)
         tb.addAction(act_back)
 
         act_fwd = QAction(self.style().standardIcon(QStyle.SP_ArrowForward), "Forward", self)
-        act_fwd.triggered.connect(self.web.forward)
+        act_fwd.triggered.connect(self.go_forward)
         tb.addAction(act_fwd)
 
         act_reload = QAction(self.style().standardIcon(QStyle.SP_BrowserReload), "Reload", self)
-        act_reload.triggered.connect(self.web.reload)
+        act_reload.triggered.connect(self.reload_page)
         tb.addAction(act_reload)
 
         tb.addSeparator()
@@ -551,55 +901,58 @@ class MainWindow(QMainWindow):
     # -------- Load from CHM path --------
     def load_from_chm_path(self, chm_path: str):
         """
-        1) Try: side-by-side .hhc/.hhk in same folder as CHM
-        2) Else: Windows hh.exe -decompile to temp -> load .hhc/.hhk from there
+        Startet das Laden im Hintergrund (ChmLoadWorker); das Ergebnis landet in _on_chm_loaded.
         """
-        folder = os.path.dirname(chm_path)
-        stem = os.path.splitext(os.path.basename(chm_path))[0]
-
-        hhc = os.path.join(folder, f"{stem}.hhc")
-        hhk = os.path.join(folder, f"{stem}.hhk")
+        self._load_seq += 1
+        seq = self._load_seq
+
+        worker = ChmLoadWorker(chm_path)
+        worker.signals.finished.connect(lambda result: self._on_chm_loaded(seq, result))
+        worker.signals.failed.connect(lambda title, text: self._on_chm_failed(seq, title, text))
+        self._load_worker = worker  # Referenz halten, solange der Pool läuft
+
+        self.status.showMessage(f"Lade {os.path.basename(chm_path)} …")
+        self.busy.show()
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_chm_loaded(self, seq: int, result: ChmLoadResult):
+        if seq != self._load_seq:
+            return  # inzwischen wurde eine andere CHM geöffnet
+        self._load_done()
+
+        self._ensure_web()
+        self._set_base_dir(result.base_dir)
+        self._populate_contents(result.toc)
+        if result.index is not None:
+            self._populate_index(result.index)
+        else:
+            self.index_model.clear()
 
-        if os.path.exists(hhc):
-            self.base_dir = folder
-            self.load_contents(hhc)
-            if os.path.exists(hhk):
-                self.load_index(hhk)
-            else:
-                self.index_model.removeRows(0, self.index_model.rowCount())
-            self.open_start_page()
-            return
+        self.open_start_page()
 
-        # fallback: decompile CHM
-        tmp = tempfile.mkdtemp(prefix="chm_decompile_")
-        ok = decompile_chm_windows(chm_path, tmp)
-        if not ok:
-            QMessageBox.warning(
-                self,
-                "TOC nicht verfügbar",
-                "Keine passende .hhc neben der CHM gefunden und CHM konnte nicht dekompiliert werden.\n\n"
-                "Windows: stelle sicher, dass 'hh.exe' verfügbar ist.\n"
-                "Alternative: CHM manuell dekompilieren und dann die entpackten Dateien anzeigen."
-            )
-            return
+        # nach dem Laden ggf. die Seite öffnen
+        if self._pending_page:
+            self.open_local(self._pending_page)
+            self._pending_page = None
 
-        # pick first .hhc/.hhk in temp
-        hhc_found = self._find_first(tmp, (".hhc",))
-        hhk_found = self._find_first(tmp, (".hhk",))
+        self.status.showMessage("Ready", 2000)
 
-        if not hhc_found:
-            QMessageBox.warning(self, "Keine .hhc gefunden", "Nach Dekomplilierung wurde keine .hhc gefunden.")
+    def _on_chm_failed(self, seq: int, title: str, text: str):
+        if seq != self._load_seq:
             return
+        self._load_done()
+        self._pending_page = None  # --page gehört zur fehlgeschlagenen CHM
+        self.status.clearMessage()
+        QMessageBox.warning(self, title, text)
 
-        self.base_dir = tmp
-        self.load_contents(hhc_found)
-        if hhk_found:
-            self.load_index(hhk_found)
-        else:
-            self.index_model.removeRows(0, self.index_model.rowCount())
+    def _load_done(self):
+        self.busy.hide()
+
+    def _set_base_dir(self, path: str):
+        self.base_dir = path
+        # normalisiert + Separator, damit "/foo" nicht "/foobar" als Präfix akzeptiert
+        self._base_norm = os.path.join(os.path.normcase(os.path.normpath(path)), "")
 
-        self.open_start_page()
-        
     def open_from_args(self, chm_path: Optional[str], page: Optional[str]):
         """
         Wird einmal beim Start aufgerufen.
@@ -610,12 +963,8 @@ class MainWindow(QMainWindow):
             self._pending_page = page
 
         if chm_path:
+            # die Seite öffnet _on_chm_loaded, sobald der Worker fertig ist
             self.load_from_chm_path(chm_path)
-
-            # nach dem Laden ggf. die Seite öffnen
-            if self._pending_page:
-                self.open_local(self._pending_page)
-                self._pending_page = None
                 
     def open_start_page(self):
         if not self.base_dir:
@@ -624,121 +973,75 @@ class MainWindow(QMainWindow):
         if os.path.exists(index_html):
             self.web.setUrl(QUrl.fromLocalFile(index_html))
         else:
-            first = self._first_local_item(self.contents_model)
-            if first:
-                self.open_local(first)
+            if self._first_local:
+                self.open_local(self._first_local)
 
     # -------- Contents / Index load --------
 
-    def load_contents(self, hhc_path: str):
-        self.contents_model.removeRows(0, self.contents_model.rowCount())
-        toc_root = parse_hh_file(hhc_path)
-        for child in toc_root.children:
-            self.contents_model.appendRow(self._node_to_item(child, parent_path=[]))
+    def _populate_contents(self, toc_root: TocNode):
+        self.contents_model.setRoot(toc_root)
+        self._first_local = toc_root.first_local
         self.contents_tree.expandToDepth(1)
 
-    def load_index(self, hhk_path: str):
-        self.index_model.removeRows(0, self.index_model.rowCount())
-        idx_root = parse_hh_file(hhk_path)
+    def _populate_index(self, idx_root: TocNode):
+        # flatten index entries (parallele Listen statt Tupel)
+        titles: List[str] = []
+        locals_: List[str] = []
 
-        # flatten index entries
-        items: List[Tuple[str, str]] = []
-
-        def walk(n: TocNode):
+        # iterativ; extendleft(reversed) hält die Dokumentreihenfolge (wichtig für Dedup)
+        dq = collections.deque(idx_root.children)
+        while dq:
+            n = dq.popleft()
             if n.local:
-                items.append((n.title.strip(), n.local.strip()))
-            for c in n.children:
-                walk(c)
+                titles.append(n.title.strip())
+                locals_.append(n.local.strip())
+            dq.extendleft(reversed(n.children))
 
-        for c in idx_root.children:
-            walk(c)
+        # lowercase einmal pro Eintrag, nicht pro Vergleich
+        keys = [t.lower() for t in titles]
 
         # Dedup:
         # 1) bevorzugt nach Local (Ziel) deduplizieren
         # 2) falls Local leer/komisch wäre: nach (title, local)
         seen_local = set()
         seen_pair = set()
-        deduped: List[Tuple[str, str]] = []
+        keep: List[int] = []
 
-        for title, local in items:
+        for i, local in enumerate(locals_):
             key_local = (local or "").lower()
-            key_pair = (title.lower(), key_local)
 
             if key_local:
                 if key_local in seen_local:
                     continue
                 seen_local.add(key_local)
             else:
+                key_pair = (keys[i], key_local)
                 if key_pair in seen_pair:
                     continue
                 seen_pair.add(key_pair)
 
-            deduped.append((title, local))
+            keep.append(i)
 
         # sort by title
-        deduped.sort(key=lambda x: x[0].lower())
-
-        for title, local in deduped:
-            it = QStandardItem(title)
-            it.setEditable(False)
-            it.setIcon(self.icon_page)
-            it.setData(local, self.ROLE_LOCAL)
-            it.setData(title, self.ROLE_BREAD)
-            self.index_model.appendRow(it)
-
-
-    def _node_to_item(self, node: TocNode, parent_path: List[str]) -> QStandardItem:
-        item = QStandardItem(node.title)
-        item.setEditable(False)
-        item.setIcon(self.icon_book if node.children else self.icon_page)
-
-        bread = " › ".join(parent_path + [node.title])
-        item.setData(node.local or "", self.ROLE_LOCAL)
-        item.setData(bread, self.ROLE_BREAD)
-
-        for c in node.children:
-            item.appendRow(self._node_to_item(c, parent_path + [node.title]))
-        return item
-
-    def _find_first(self, folder: str, exts: Tuple[str, ...]) -> Optional[str]:
-        for fn in os.listdir(folder):
-            if fn.lower().endswith(exts):
-                return os.path.join(folder, fn)
-        return None
-
-    def _first_local_item(self, model: QStandardItemModel) -> Optional[str]:
-        def walk(it: QStandardItem) -> Optional[str]:
-            loc = it.data(self.ROLE_LOCAL)
-            if loc:
-                return loc
-            for r in range(it.rowCount()):
-                v = walk(it.child(r))
-                if v:
-                    return v
-            return None
+        order = sorted(keep, key=keys.__getitem__)
 
-        for r in range(model.rowCount()):
-            v = walk(model.item(r))
-            if v:
-                return v
-        return None
+        self.index_model.setEntries(
+            [titles[i] for i in order],
+            [locals_[i] for i in order],
+            [keys[i] for i in order],
+        )
 
     # -------- Click handlers --------
+    # Proxy reicht data() für die User-Rollen durch -> kein mapToSource nötig
     def on_contents_clicked(self, proxy_idx: QModelIndex):
-        src_idx = self.contents_proxy.mapToSource(proxy_idx)
-        item = self.contents_model.itemFromIndex(src_idx)
-        if item:
-            self._open_item(item)
+        self._open_item(proxy_idx)
 
     def on_index_clicked(self, proxy_idx: QModelIndex):
-        src_idx = self.index_proxy.mapToSource(proxy_idx)
-        item = self.index_model.itemFromIndex(src_idx)
-        if item:
-            self._open_item(item)
-
-    def _open_item(self, item: QStandardItem):
-        local = (item.data(self.ROLE_LOCAL) or "").strip()
-        bread = (item.data(self.ROLE_BREAD) or "—").strip()
+        self._open_item(proxy_idx)
+
+    def _open_item(self, proxy_idx: QModelIndex):
+        local = (proxy_idx.data(self.ROLE_LOCAL) or "").strip()
+        bread = (proxy_idx.data(self.ROLE_BREAD) or "—").strip()
         self.breadcrumb.setText(bread)
         if local:
             self.open_local(local)
@@ -752,28 +1055,8 @@ class MainWindow(QMainWindow):
         x, y = pos.x(), pos.y()
         w, h = self.width(), self.height()
 
-        left = x <= m
-        right = x >= w - m
-        top = y <= m
-        bottom = y >= h - m
-
-        if top and left:
-            return "LT"
-        if top and right:
-            return "RT"
-        if bottom and left:
-            return "LB"
-        if bottom and right:
-            return "RB"
-        if left:
-            return "L"
-        if right:
-            return "R"
-        if top:
-            return "T"
-        if bottom:
-            return "B"
-        return None
+        code = (x <= m) | ((x >= w - m) << 1) | ((y <= m) << 2) | ((y >= h - m) << 3)
+        return _EDGES[code]
 
 
     def _set_cursor_for_edge(self, edge):
@@ -857,7 +1140,7 @@ class MainWindow(QMainWindow):
             return
 
         # already URL?
-        if re.match(r"^[a-zA-Z]+://", local):
+        if _URL_RE.match(local):
             self.web.setUrl(QUrl(local))
             return
 
@@ -868,8 +1151,8 @@ class MainWindow(QMainWindow):
         abs_path = os.path.normpath(os.path.join(self.base_dir, path_part))
 
         # safety: stay inside base_dir
-        base_norm = os.path.normpath(self.base_dir)
-        if not os.path.normpath(abs_path).startswith(base_norm):
+        abs_n = os.path.normcase(abs_path)
+        if not abs_n.startswith(self._base_norm) and abs_n != self._base_norm[:-1]:
             QMessageBox.warning(self, "Ungültiger Pfad", f"Pfad außerhalb Basisordner:\n{abs_path}")
             return
 
@@ -896,7 +1179,7 @@ class MainWindow(QMainWindow):
             return
 
         url = QUrl.fromLocalFile(search_html)
-        q_enc = re.sub(r"\s+", "+", q)
+        q_enc = _WS_RE.sub("+", q)
         url.setQuery(f"q={q_enc}")
         self.web.setUrl(url)
 
@@ -908,6 +1191,45 @@ class MainWindow(QMainWindow):
         if os.path.exists(home):
             self.web.setUrl(QUrl.fromLocalFile(home))
 
+    def go_back(self):
+        if self.web is not None:
+            self.web.back()
+
+    def go_forward(self):
+        if self.web is not None:
+            self.web.forward()
+
+    def reload_page(self):
+        if self.web is not None:
+            self.web.reload()
+
+    # -------- Web (lazy) --------
+    def _ensure_web(self):
+        if self.web is not None:
+            return self.web
+
+        from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineScript
+
+        self.web = QWebEngineView()
+
+        # Dark-CSS als persistentes User-Script: läuft bei jedem Laden von selbst,
+        # kein runJavaScript pro URL-Wechsel
+        self._dark_css_script = QWebEngineScript()
+        self._dark_css_script.setName(_DARK_CSS_SCRIPT_NAME)
+        self._dark_css_script.setSourceCode(_DARK_CSS_JS)
+        self._dark_css_script.setInjectionPoint(QWebEngineScript.DocumentReady)
+        self._dark_css_script.setWorldId(QWebEngineScript.MainWorld)
+
+        self.splitter.replaceWidget(1, self.web)
+        self._web_placeholder.deleteLater()
+        self._web_placeholder = None
+
+        self._styled_widgets.append(self.web)
+        self.web.setPalette(QApplication.instance().palette())
+        self._apply_web_theme()
+        self._inject_web_css()
+        return self.web
+
     # -------- Theme --------
     def toggle_theme(self):
         self.dark_mode = not self.dark_mode
@@ -915,185 +1237,154 @@ class MainWindow(QMainWindow):
         self._apply_theme()
         self._inject_web_css()
     
-    def _apply_theme(self):
-        app = QApplication.instance()
-        pal = QPalette()
-        
-        if self.dark_mode:
-            pal.setColor(QPalette.Window, QColor(30, 30, 30))
+    def _build_palette(self, dark: bool) -> QPalette:
+        if dark:
+            pal = QPalette()
+            pal.setColor(QPalette.Window, _DARK_WINDOW)
             pal.setColor(QPalette.WindowText, Qt.white)
-            pal.setColor(QPalette.Base, QColor(24, 24, 24))
-            pal.setColor(QPalette.AlternateBase, QColor(35, 35, 35))
-            pal.setColor(QPalette.Text, Qt.white)
-            pal.setColor(QPalette.Button, QColor(45, 45, 45))
-            pal.setColor(QPalette.ButtonText, Qt.white)
-            pal.setColor(QPalette.Highlight, QColor(80, 120, 200))
-            pal.setColor(QPalette.HighlightedText, Qt.white)
-        else:
-            pal = app.style().standardPalette()
-        
-        app.setPalette(pal)
-        
-        if self.dark_mode:
-            header_bg               = "#222222"
-            header_fg               = "#ffd866"
-            tree_bg                 = "#181818"
-            tree_fg                 = "#ffffff"
-            sel_bg                  = "#2b4c7e"
-            sel_fg                  = "#ffffff"
-            border                  = "#333333"
-            
-            tab_bg                  = "#1c1c1c"
-            tab_bar_bg              = "#161616"
-            tab_fg                  = "#eaeaea"
-            tab_fg_active           = "#ffd866"
-            tab_sel_bg              = "#242424"
-            tab_hover_bg            = "#202020"
-            
-            toolbar_bg              = "#1a1a1a"
-            toolbtn_bg              = "#222222"
-            toolbtn_fg              = "#ffd866"
-            toolbtn_hover           = "#2a2a2a"
-            toolbtn_pressed         = "#303030"
-            
-            title_bg                = "#121212"  # Hintergrund Titelleiste
-            title_fg                = "#ffd866"  # Text/Farbe Buttons (oder "#ffffff")
-            title_btn_bg            = "#1f1f1f"  # Buttons normal
-            title_btn_hover         = "#2a2a2a"  # Buttons hover
-            title_btn_close_hover   = "#8a1f1f"  # Close hover
-            
-            status_bg               = "#121212"
-            status_fg               = "#ffd866"  # oder "#ffffff"
-            status_border           = "#333333"
-            
-            # Scrollbar dark-blue
-            scroll_track            = "#141414"
-            scroll_handle           = "#0b2a4a"
-            scroll_handle_hover     = "#0f3a66"
+            pal.setColor(QPalette.AlternateBase, _DARK_ALT)
         else:
-            header_bg               = "#f0f0f0"
-            header_fg               = "#000000"
-            tree_bg                 = "#ffffff"
-            tree_fg                 = "#000000"
-            sel_bg                  = "#cfe3ff"
-            sel_fg                  = "#000000"
-            border                  = "#d0d0d0"
-            
-            tab_bg                  = "#f4f4f4"
-            tab_bar_bg              = "#ededed"
-            tab_fg                  = "#000000"
-            tab_fg_active           = "#000000"
-            tab_sel_bg              = "#ffffff"
-            tab_hover_bg            = "#f9f9f9"
-            
-            toolbar_bg              = "#f2f2f2"
-            toolbtn_bg              = "#e9e9e9"
-            toolbtn_fg              = "#000000"
-            toolbtn_hover           = "#dedede"
-            toolbtn_pressed         = "#d2d2d2"
-            
-            title_bg                = "#eaeaea"
-            title_fg                = "#000000"
-            title_btn_bg            = "#f3f3f3"
-            title_btn_hover         = "#dedede"
-            title_btn_close_hover   = "#e06c75"
-            
-            status_bg               = "#ededed"
-            status_fg               = "#000000"
-            status_border           = "#d0d0d0"
-            
-            # Scrollbar light-gray
-            scroll_track            = "#f2f2f2"
-            scroll_handle           = "#c8c8c8"
-            scroll_handle_hover     = "#b0b0b0"
-        
-        self.setStyleSheet(f"""
-QToolBar {{spacing: 8px;background: {toolbar_bg};border: none;}}
-QToolBar::separator {{background: {border};width: 1px;margin: 6px 8px;}}
-QLineEdit {{padding: 6px 10px;border-radius: 10px;border: 1px solid {border};background: {tab_bg};color: {tab_fg};}}
-QLabel {{color: {tab_fg};}}
-QToolButton {{background: {toolbtn_bg};color: {toolbtn_fg};border: 1px solid {border};border-radius: 10px;padding: 6px 10px;}}
-QToolButton:hover {{background: {toolbtn_hover};}}
-QToolButton:pressed {{background: {toolbtn_pressed};}}
-QTabWidget::pane {{border: 1px solid {border};top: -1px;background: {tab_bg};}}
-QTabBar {{background: {tab_bar_bg};}}
-QTabBar::tab {{background: {tab_bar_bg};color: {tab_fg};border: 1px solid {border};border-bottom: none;padding: 7px 14px;margin-right: 6px;border-top-left-radius: 12px;border-top-right-radius: 12px;min-width: 90px;}}
-QTabBar::tab:hover {{background: {tab_hover_bg};}}
-QTabBar::tab:selected {{background: {tab_sel_bg};color: {tab_fg_active};}}
-QTreeView {{border: none;background: {tree_bg};color: {tree_fg};}}
-QTreeView::item:selected {{background: {sel_bg};color: {sel_fg};}}
-QHeaderView::section {{background: {header_bg};color: {header_fg};padding: 6px;border: none;border-bottom: 1px solid {border};}}
-QPushButton {{background: {toolbtn_bg};color: {toolbtn_fg};border: 1px solid {border};border-radius: 10px;padding: 7px 12px;}}
-QPushButton:hover {{background: {toolbtn_hover};}}
-QPushButton:pressed {{background: {toolbtn_pressed};}}
-/* Scrollbars (TreeView etc.) */
-QScrollBar:vertical {{background: {scroll_track};width: 12px;margin: 0px;border: none;border-radius: 6px;}}
-QScrollBar::handle:vertical {{background: {scroll_handle};min-height: 28px;border-radius: 6px;}}
-QScrollBar::handle:vertical:hover {{background: {scroll_handle_hover};}}
-QScrollBar::add-line:vertical,QScrollBar::sub-line:vertical {{height: 0px;}}
-QScrollBar::add-page:vertical,QScrollBar::sub-page:vertical {{background: transparent;}}
-QScrollBar:horizontal {{background: {scroll_track};height: 12px;margin: 0px;border: none;border-radius: 6px;}}
-QScrollBar::handle:horizontal {{background: {scroll_handle};min-width: 28px;border-radius: 6px;}}
-QScrollBar::handle:horizontal:hover {{background: {scroll_handle_hover};}}
-QScrollBar::add-line:horizontal,QScrollBar::sub-line:horizontal {{width: 0px;}}
-QScrollBar::add-page:horizontal,QScrollBar::sub-page:horizontal {{background: transparent;}}
-/* Custom Title Bar */
-#TopContainer {{ background: transparent; }}
-#TitleBar {{background: {title_bg};}}
-#TitleLabel {{color: {title_fg};font-weight: 600;}}
-#TitleSeparator {{background: {border};}}
-QPushButton#TitleBtnMin,QPushButton#TitleBtnMax,QPushButton#TitleBtnClose {{background: {title_btn_bg};color: {title_fg};border: 1px solid {border};border-radius: 10px;}}
-QPushButton#TitleBtnMin:hover,QPushButton#TitleBtnMax:hover {{background: {title_btn_hover};}}
-QPushButton#TitleBtnClose:hover {{background: {title_btn_close_hover};}}
-QStatusBar {{background: {status_bg};color: {status_fg};border-top: 1px solid {status_border};}}
-QStatusBar QLabel {{color: {status_fg};}}
-/* Tab scrollers (left/right arrows) */
-QTabBar::scroller {{width: 22px;height: 22px;background: {tab_bar_bg};border: 1px solid {border};border-radius: 10px;margin: 2px;}}
-QTabBar::scroller:hover {{background: {tab_hover_bg};}}
-/* Arrow icons color via "color" + qproperty (works in many styles) */
-QTabBar QToolButton {{background: {tab_bar_bg};border: 1px solid {border};border-radius: 10px;padding: 2px;color: {tab_fg_active};}}
-QTabBar QToolButton:hover {{background: {tab_hover_bg};}}
-QTabBar QToolButton:pressed {{background: {tab_sel_bg};}}
-QSplitter {{background: {tree_bg};}}
-QSplitter::handle {{background: {border};}}
-QWebEngineView {{background: {tree_bg};}}""")
+            pal = QPalette(self._standard_palette)
+
+        # Farben, die bisher per QSS gesetzt wurden, kommen aus der Palette
+        # (TreeView, Auswahl, Header, PushButton)
+        v = DARK_VARS if dark else LIGHT_VARS
+        pal.setColor(QPalette.Base, _qcolor(v["tree_bg"]))
+        pal.setColor(QPalette.Text, _qcolor(v["tree_fg"]))
+        pal.setColor(QPalette.Highlight, _qcolor(v["sel_bg"]))
+        pal.setColor(QPalette.HighlightedText, _qcolor(v["sel_fg"]))
+        pal.setColor(QPalette.Button, _qcolor(v["toolbtn_bg"]))
+        pal.setColor(QPalette.ButtonText, _qcolor(v["toolbtn_fg"]))
+        return pal
+
+    def _apply_theme(self):
+        # Palette/QSS lösen ein Repolish aller Widgets aus – nur bei echtem Wechsel
+        if self._applied_theme == self.dark_mode:
+            return
+
+        app = QApplication.instance()
+        pal = self._dark_palette if self.dark_mode else self._light_palette
+
+        # Palette + Stylesheet zusammen umstellen -> nur ein Repaint
+        self.setUpdatesEnabled(False)
+        try:
+            app.setPalette(pal)
+            for w in self._styled_widgets:
+                w.setPalette(pal)
+
+            # ein Stylesheet für die ganze App statt pro Fenster
+            app.setStyleSheet(self._stylesheet())
+
+            self._apply_web_theme()
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+
+        self._applied_theme = self.dark_mode
 
+    def _apply_web_theme(self):
+        if self.web is None:
+            return
         if self.dark_mode:
             self.web.setStyleSheet("background: #141414;")
         else:
             self.web.setStyleSheet("background: white;")
 
+    def _stylesheet(self) -> str:
+        qss = self._qss_cache.get(self.dark_mode)
+        if qss is None:
+            qss = _QSS_TEMPLATE.substitute(DARK_VARS if self.dark_mode else LIGHT_VARS)
+            MainWindow._qss_cache[self.dark_mode] = qss
+        return qss
+
     def _inject_web_css(self):
+        if self.web is None:
+            return
+        page = self.web.page()
+        scripts = page.scripts()
+        for old in scripts.findScripts(_DARK_CSS_SCRIPT_NAME):
+            scripts.remove(old)
         if self.dark_mode:
-            js = """
-(function(){const id='__qt_dark_css__';let s=document.getElementById(id);if(!s){s=document.createElement('style');
-s.id=id;s.innerHTML=`html, body { background:#141414 !important;color:#eaeaea !important;}
-a { color:#8ab4ff !important;}pre, code { background:#1e1e1e !important;}
-`;document.head.appendChild(s);}})();"""
+            scripts.insert(self._dark_css_script)
+
+        # verhindert weißes Aufblitzen beim Laden im Dark Mode
+        page.setBackgroundColor(_qcolor("#141414") if self.dark_mode else QColor(Qt.white))
+
+        # aktuelle Seite sofort umstellen, alle weiteren erledigt das Script
+        page.runJavaScript(_DARK_CSS_JS if self.dark_mode else _LIGHT_CSS_JS)
+
+_USAGE = """usage: pyview.py [-h] [--page PAGE] [chm]
+
+CHM-Viewer - (c) 2026 Dimitri Haesch & Co.
+
+positional arguments:
+  chm                   path tp CHM file
+
+options:
+  -h, --help            show this help message and exit
+  --page PAGE, -p PAGE  relative page e.g. "index.html" or "api/mod.html#MyClass"
+"""
+
+
+def _parse_args(argv: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Minimaler Ersatz für argparse (spart den Import beim Start).
+    Rückgabe: (chm, page)
+    """
+    chm: Optional[str] = None
+    page: Optional[str] = None
+
+    def fail(msg: str):
+        sys.stderr.write(_USAGE.split("\n\n", 1)[0] + f"\npyview.py: error: {msg}\n")
+        sys.exit(2)
+
+    positional: List[str] = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--":
+            # wie argparse: alles danach ist positional
+            positional.extend(argv[i + 1:])
+            break
+        elif arg in ("-h", "--help"):
+            sys.stdout.write(_USAGE)
+            sys.exit(0)
+        elif arg in ("-p", "--page"):
+            if i + 1 >= len(argv):
+                fail("argument --page/-p: expected one argument")
+            i += 1
+            page = argv[i]
+        elif arg.startswith("--page="):
+            page = arg[len("--page="):]
+        elif arg.startswith("-p="):
+            page = arg[len("-p="):]
+        elif arg.startswith("-p") and len(arg) > 2:
+            page = arg[2:]
+        elif arg.startswith("-") and arg != "-":
+            fail(f"unrecognized arguments: {arg}")
         else:
-            js = """(function(){const s=document.getElementById('__qt_dark_css__');if(s) s.remove();})();"""
-        self.web.page().runJavaScript(js)
+            positional.append(arg)
+        i += 1
+
+    if len(positional) > 1:
+        fail("unrecognized arguments: " + " ".join(positional[1:]))
+    if positional:
+        chm = positional[0]
+
+    return chm, page
 
-    def _on_url_changed(self, url: QUrl):
-        self._inject_web_css()
-        
-    def _style_theme_button(self):
-        # sorgt dafür, dass der Button im Dark Mode wirklich "dark" aussieht
-        # (QAction selbst ist kein Widget, aber wir können die Toolbar/Button-Styles über QSS steuern)
-        pass
 
 def main():
-    parser = argparse.ArgumentParser(description="CHM-Viewer - (c) 2026 Dimitri Haesch & Co.")
-    parser.add_argument("chm", nargs="?", help="path tp CHM file")
-    parser.add_argument("--page", "-p", default=None, help='relative page e.g. "index.html" or "api/mod.html#MyClass"')
-    args = parser.parse_args()
+    chm, page = _parse_args(sys.argv[1:])
 
+    # erlaubt den späten Import von QtWebEngineWidgets (nach dem QApplication-Start)
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     w = MainWindow()
     w.show()
 
     # Optional direkt öffnen
-    w.open_from_args(args.chm, args.page)
+    w.open_from_args(chm, page)
 
     sys.exit(app.exec_())
 
@@ -0,0 +1,142 @@
+"""
+Parser für htmlhelp .hhc/.hhk – reines Python ohne Qt.
+Getrennt von pyview.py, damit das Modul mit mypyc kompiliert werden kann
+(``mypyc pyview_parser.py``); pyview importiert es unverändert.
+"""
+import re
+import sys
+
+from dataclasses import dataclass, field
+from typing      import Dict, List, Optional
+from html        import unescape
+
+
+@dataclass
+class TocNode:
+    title: str
+    local: Optional[str] = None
+    children: List["TocNode"] = field(default_factory=list)
+    parent: Optional["TocNode"] = field(default=None, repr=False, compare=False)
+    row: int = field(default=0, compare=False)  # Position in parent.children
+    title_lc: str = field(default="", repr=False, compare=False)  # für den Filter, einmal beim Parsen
+    first_local: Optional[str] = field(default=None, compare=False)  # nur ROOT: erste Seite (DFS)
+
+
+# .hhc/.hhk enthalten nur wenige relevante Tags -> ein Regex-Scan statt HTMLParser
+# Attributwerte in Quotes dürfen ">" enthalten (z.B. "operator>" oder "Vector<T>")
+# Kommentare werden als eigener Treffer verschluckt (wie bei HTMLParser ignoriert)
+_HH_TOKEN_RE = re.compile(
+    r"""<!--.*?-->|<(/?)(object|param|ul)\b((?:"[^"]*"|'[^']*'|[^'">])*)>""", re.I | re.S
+)
+_HH_ATTR_RE = re.compile(r"""([^\s=/>]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+
+
+# nur kurze Strings internieren (Titel/Dateinamen wiederholen sich oft), lange nicht
+_INTERN_MAX_LEN = 64
+
+
+def _intern(s: str) -> str:
+    return sys.intern(s) if len(s) < _INTERN_MAX_LEN else s
+
+
+def _hh_attrs(raw: str) -> Dict[str, str]:
+    attrs: Dict[str, str] = {}
+    for m in _HH_ATTR_RE.finditer(raw):
+        value = m.group(2)
+        if value is None:
+            value = m.group(3) if m.group(3) is not None else m.group(4)
+        attrs[m.group(1).lower()] = unescape(value)
+    return attrs
+
+
+def parse_hh_fast(raw: str) -> TocNode:
+    """
+    Parser für htmlhelp .hhc (Contents) und .hhk (Index).
+    Beide nutzen:
+      <OBJECT type="text/sitemap">
+         <param name="Name" value="...">
+         <param name="Local" value="...">
+      </OBJECT>
+      <UL> ... </UL> (optional)
+    root.first_local bekommt die erste Seite mit Local (Dokumentreihenfolge = DFS),
+    damit beim Start kein zweiter Durchlauf über den Baum nötig ist.
+    """
+    root = TocNode("ROOT")
+    stack: List[TocNode] = [root]
+
+    in_object = False
+    cur_name: Optional[str] = None
+    cur_local: Optional[str] = None
+
+    last_created: Optional[TocNode] = None
+    pending_push_on_ul = False
+
+    for m in _HH_TOKEN_RE.finditer(raw):
+        if m.group(2) is None:
+            continue  # <!-- ... -->
+        closing = bool(m.group(1))
+        tag = m.group(2).lower()
+
+        if not closing:
+            if tag == "object":
+                t = (_hh_attrs(m.group(3)).get("type") or "").lower()
+                if "text/sitemap" in t:
+                    in_object = True
+                    cur_name = None
+                    cur_local = None
+
+            elif tag == "param" and in_object:
+                attrs = _hh_attrs(m.group(3))
+                name = (attrs.get("name") or "").lower()
+                value = (attrs.get("value") or "").strip()
+                if name == "name":
+                    cur_name = value
+                elif name == "local":
+                    cur_local = value
+
+            elif tag == "ul":
+                if pending_push_on_ul and last_created is not None:
+                    stack.append(last_created)
+                    pending_push_on_ul = False
+
+        elif tag == "object" and in_object:
+            in_object = False
+            title = _intern((cur_name or "Untitled").strip())
+            local = (cur_local or "").strip() or None
+            if local:
+                local = _intern(local)
+
+            siblings = stack[-1].children
+            node = TocNode(title=title, local=local, parent=stack[-1], row=len(siblings),
+                           title_lc=title.lower())
+            siblings.append(node)
+            if local and root.first_local is None:
+                root.first_local = local
+
+            last_created = node
+            pending_push_on_ul = True
+
+        elif tag == "ul":
+            if len(stack) > 1:
+                stack.pop()
+
+    return root
+
+
+def _read_text_fallback(path: str) -> str:
+    # einmal lesen, BOM prüfen, dann nur noch im Speicher dekodieren
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:3] == b"\xef\xbb\xbf":
+        return data[3:].decode("utf-8", errors="replace")
+    for enc in ("utf-8", "cp1252", "latin-1"):
+        try:
+            return data.decode(enc)
+        except UnicodeDecodeError:
+            pass
+    return data.decode("utf-8", errors="ignore")
+
+
+def parse_hh_file(path: str) -> TocNode:
+    raw = _read_text_fallback(path)
+    return parse_hh_fast(raw)
@@ -0,0 +1,56 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pyview_parser import parse_hh_fast  # noqa: E402
+
+
+HHC = """<HTML><BODY>
+<UL>
+<!-- <LI> <OBJECT type="text/sitemap"><param name="Name" value="Hidden"><param name="Local" value="hidden.html"></OBJECT> -->
+<LI> <OBJECT type="text/sitemap">
+  <param name="Name" value="Intro &amp; more">
+  <param name="Local" value="intro.html">
+  </OBJECT>
+  <UL>
+   <LI> <object TYPE='text/sitemap'><PARAM NAME=Name VALUE="a > b"><param name="Local" value="a/b.html#x"/></object>
+   <LI> <object type="text/sitemap"><param name="Name" value='Vector<T>'></object>
+  </UL>
+<LI> <OBJECT type="text/sitemap"><param name="Name" value="Second"><param name="Local" value="second.html"></OBJECT>
+</UL></BODY></HTML>"""
+
+
+def _dump(node):
+    return (node.title, node.local, [_dump(c) for c in node.children])
+
+
+def test_parse_tree():
+    root = parse_hh_fast(HHC)
+    assert _dump(root)[2] == [
+        ("Intro & more", "intro.html", [
+            ("a > b", "a/b.html#x", []),
+            ("Vector<T>", None, []),
+        ]),
+        ("Second", "second.html", []),
+    ]
+
+
+def test_first_local_and_parent():
+    root = parse_hh_fast(HHC)
+    assert root.first_local == "intro.html"
+    assert root.local is None
+    sub = root.children[0].children[0]
+    assert sub.parent is root.children[0]
+    assert root.children[0].parent is root
+
+
+def test_rows_match_position():
+    root = parse_hh_fast(HHC)
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        for i, c in enumerate(n.children):
+            assert c.row == i
+            assert c.title_lc == c.title.lower()
+            stack.append(c)